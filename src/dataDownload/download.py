@@ -1,11 +1,17 @@
 import requests
 import zipfile
 import os
+import shutil
+import tempfile
 from pathlib import Path
 import sys
 import os
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ChunkedEncodingError
+from urllib3.util.retry import Retry
 
 # Add src to system path
 sys.path.append(str(Path.cwd().parent))
@@ -13,8 +19,45 @@ sys.path.append(str(Path.cwd().parent))
 # import modules
 from utils.utils import measure_execution_time
 
+# Minimum number of seconds between two progress prints
+PROGRESS_INTERVAL = 0.25
+
+# (connect, read) timeouts in seconds for every request, so a stalled connection raises instead of hanging
+REQUEST_TIMEOUT = (10, 60)
+
+# Maximum size in bytes of a ZIP file kept in memory before spilling to a temporary file
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+def _make_session(pool_size: int = 16) -> requests.Session:
+    """
+    Creates a requests.Session with a connection pool of pool_size connections per host and automatic
+    retries (with exponential backoff) on connection errors and transient 502/503/504 responses.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # raise_on_status=False hands the last 5xx response back to the callers' status checks once retries
+        # are exhausted, instead of raising RetryError
+        max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504], raise_on_status=False)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _format_progress(downloaded_size: int, total_size: int) -> str:
+    """
+    Formats a progress message, showing the percentage only when the total size is known (non-zero).
+    """
+    if total_size:
+        return f"Downloaded {downloaded_size}/{total_size} bytes ({(downloaded_size / total_size) * 100:.2f}%)"
+    return f"Downloaded {downloaded_size} bytes"
+
+# Default session shared by the downloaders, so TCP/TLS connections are reused across calls
+_SESSION = _make_session()
+
 @measure_execution_time
-def download_shp(url: str, filename: str, unzip: bool = False, deleteZip: bool = True, chunk_size: int = 8192) -> None:
+def download_shp(url: str, filename: str, unzip: bool = False, deleteZip: bool = True, chunk_size: int = 1024 * 1024, session: requests.Session = None) -> bool:
     """
     Downloads a file from a URL and optionally extracts it if it's a ZIP file.
 
@@ -22,8 +65,13 @@ def download_shp(url: str, filename: str, unzip: bool = False, deleteZip: bool =
         url (str): The URL of the file to download.
         filename (str): The local filename to save the downloaded file as.
         unzip (bool): Whether to extract the file if it's a ZIP file. Default is False.
-        chunk_size (int): The size of chunks for streaming downloads. Default is 8192 bytes.
-        deleteZip (bool): Whether to delete zipped files after extraction.
+        chunk_size (int): The size of chunks for streaming downloads. Default is 1 MB.
+        deleteZip (bool): Whether to delete zipped files after extraction. If True, the ZIP file is extracted
+            from memory (or a temporary file if larger than SPOOL_MAX_SIZE) and never written to filename.
+        session (requests.Session): Optional session to use instead of the module's default pooled session.
+
+    Returns:
+        bool: True if the file was downloaded (and extracted, if requested), False if it failed.
     """
     try:
         filename_print = os.path.basename(filename)
@@ -33,48 +81,57 @@ def download_shp(url: str, filename: str, unzip: bool = False, deleteZip: bool =
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
 
         # Download the file with streaming for large files
-        response = requests.get(url, stream=True)
+        response = (session or _SESSION).get(url, stream=True, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        with open(filename, 'wb') as f:
+        # When the ZIP file is not meant to be kept, spool it in memory (spilling to a temporary
+        # file if it is large) and extract it from there instead of writing and re-reading it on disk
+        spool_zip = unzip and deleteZip
+        with (tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) if spool_zip else open(filename, 'w+b')) as f:
             for chunk in response.iter_content(chunk_size=chunk_size):
                 if chunk:
                     f.write(chunk)
-        print(f"Downloaded: {filename_print}")
-
-        # Check if the file exists and is non-empty before unzipping
-        if unzip and os.path.exists(filename) and os.path.getsize(filename) > 0:
-            file_base_name = os.path.splitext(os.path.basename(filename))[0]
-            extract_directory = Path(filename).parent / file_base_name
-            try:
-                with zipfile.ZipFile(filename, 'r') as zip_ref:
-                    zip_ref.extractall(extract_directory)
-                print(f"Extracted files to: {extract_directory}")
-                
-                # Delete the ZIP file after extraction if desired
-                if deleteZip:
-                    Path(filename).unlink(missing_ok=True)
-                    if not Path(filename).exists():
-                        print(f"Deleted ZIP file: {filename}")
-                    else:
-                        print(f"Failed to delete ZIP file: {filename}")
-                    
-            except zipfile.BadZipFile:
-                print(f"Error: {filename} is not a valid ZIP file.")
+            print(f"Downloaded: {filename_print}")
+
+            # Check if the file is non-empty before unzipping
+            if unzip and f.tell() > 0:
+                file_base_name = os.path.splitext(os.path.basename(filename))[0]
+                extract_directory = Path(filename).parent / file_base_name
+                try:
+                    f.seek(0)
+                    with zipfile.ZipFile(f, 'r') as zip_ref:
+                        zip_ref.extractall(extract_directory)
+                    print(f"Extracted files to: {extract_directory}")
+
+                except zipfile.BadZipFile:
+                    print(f"Error: {filename} is not a valid ZIP file.")
+
+                    # Keep the invalid file on disk for inspection
+                    if spool_zip:
+                        f.seek(0)
+                        with open(filename, 'wb') as out:
+                            shutil.copyfileobj(f, out, length=chunk_size)
+                    return False
+        return True
     except requests.RequestException as e:
         print(f"Download failed: {e}")
     except OSError as e:
         print(f"File operation failed: {e}")
+    return False
 
 @measure_execution_time
-def download_GeoTIFF(url: str, filename: str, chunk_size: int = 8192) -> None:
+def download_GeoTIFF(url: str, filename: str, chunk_size: int = 1024 * 1024, session: requests.Session = None) -> bool:
     """
     Downloads a file from a URL.
 
     Parameters:
         url (str): The URL of the file to download.
         filename (str): The local filename to save the downloaded file as.
-        chunk_size (int): The size of chunks for streaming downloads. Default is 8192 bytes.
+        chunk_size (int): The size of chunks for streaming downloads. Default is 1 MB.
+        session (requests.Session): Optional session to use instead of the module's default pooled session.
+
+    Returns:
+        bool: True if the file was downloaded, False if it failed.
     """
     try:
         filename_print = os.path.basename(filename)
@@ -84,31 +141,37 @@ def download_GeoTIFF(url: str, filename: str, chunk_size: int = 8192) -> None:
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
 
         # Download the file with streaming for large files
-        response = requests.get(url, stream=True)
+        response = (session or _SESSION).get(url, stream=True, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
         # Get the total size of the file from the server
         total_size = int(response.headers.get('Content-Range', '').split('/')[-1]) if 'Content-Range' in response.headers else int(response.headers.get('Content-Length', 0))
         downloaded_size = 0
+        last_print = 0.0
 
         with open(filename, 'wb') as f:
             for chunk in response.iter_content(chunk_size=chunk_size):
                 if chunk:
                     f.write(chunk)
                     downloaded_size += len(chunk)
-                    # Display progress
-                    print(f"Downloaded {downloaded_size}/{total_size} bytes ({(downloaded_size / total_size) * 100:.2f}%)", end="\r")
+                    # Display progress, at most once every PROGRESS_INTERVAL seconds
+                    now = time.monotonic()
+                    if now - last_print > PROGRESS_INTERVAL:
+                        print(_format_progress(downloaded_size, total_size), end="\r")
+                        last_print = now
 
+        print(_format_progress(downloaded_size, total_size))
         print(f"Downloaded: {filename_print}")
-
+        return True
 
     except requests.RequestException as e:
         print(f"Download failed: {e}")
     except OSError as e:
         print(f"File operation failed: {e}")
+    return False
 
 @measure_execution_time
-def download_large_file(url: str, destination: str, max_retries: int =3, chunk_size: int = 1024 * 1024):
+def download_large_file(url: str, destination: str, max_retries: int =3, chunk_size: int = 1024 * 1024, session: requests.Session = None):
     """
     Downloads a file from a given URL in chunks, with support for resuming the download if interrupted and retrying on errors.
 
@@ -118,6 +181,7 @@ def download_large_file(url: str, destination: str, max_retries: int =3, chunk_s
         destination (str): The local file path where the downloaded file will be saved.
         max_retries (int): The maximum number of times to retry the download on error. Default is 3.
         chunk_size (int): The size of chunks to download the file in bytes. Default is 1 MB.
+        session (requests.Session): Optional session to use instead of the module's default pooled session.
 
     Functionality:
     --------------
@@ -125,7 +189,8 @@ def download_large_file(url: str, destination: str, max_retries: int =3, chunk_s
         - Resumes the download from where it left off using the 'Range' HTTP header.
         - Downloads the file in chunks (default: 10 MB) to minimize memory usage.
         - Displays download progress in the console.
-        - Implements retry logic for handling connection interruptions such as ChunkedEncodingError.
+        - Implements retry logic for handling connection interruptions such as ChunkedEncodingError,
+          dropped connections and timeouts.
         - Ensures compatibility with servers supporting HTTP range requests.
 
     Note:
@@ -133,6 +198,11 @@ def download_large_file(url: str, destination: str, max_retries: int =3, chunk_s
         - Ensure the server supports partial downloads (HTTP status code 206).
         - If the server does not support range requests, the download will restart from the beginning.
         - The function will retry up to 3 times on certain connection errors before failing.
+        - To split a single large file over several parallel range requests, use download_large_file_parallel.
+
+    Returns:
+    --------
+        bool: True if the download completed, False if the server answered with an error status.
 
     Raises:
     -------
@@ -152,36 +222,221 @@ def download_large_file(url: str, destination: str, max_retries: int =3, chunk_s
             # Get the total size of the file from the server
             headers = {"Range": f"bytes={downloaded_size}-"}  # Resume from the downloaded size
 
-            with requests.get(url, headers=headers, stream=True) as response:
+            with (session or _SESSION).get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
                 # Ensure the server supports partial downloads
                 if response.status_code == 206 or response.status_code == 200:
                     total_size = int(response.headers.get('Content-Range', '').split('/')[-1]) if 'Content-Range' in response.headers else int(response.headers.get('Content-Length', 0))
 
-                    # Open the file in append mode and write chunks
-                    with open(destination, "ab") as file:
+                    # A 200 response ignored the Range header and sends the whole file: restart instead of appending
+                    if response.status_code == 200:
+                        downloaded_size = 0
+
+                    # Open the file in append mode (or truncate it when restarting) and write chunks
+                    with open(destination, "ab" if response.status_code == 206 else "wb") as file:
                         print(f"Starting download: {destination} ({downloaded_size}/{total_size} bytes)")
+                        last_print = 0.0
 
                         for chunk in response.iter_content(chunk_size=chunk_size): 
                             if chunk:  # Filter out keep-alive chunks
                                 file.write(chunk)
                                 downloaded_size += len(chunk)
 
-                                # Display progress
-                                print(f"Downloaded {downloaded_size}/{total_size} bytes ({(downloaded_size / total_size) * 100:.2f}%)", end="\r")
+                                # Display progress, at most once every PROGRESS_INTERVAL seconds
+                                now = time.monotonic()
+                                if now - last_print > PROGRESS_INTERVAL:
+                                    print(_format_progress(downloaded_size, total_size), end="\r")
+                                    last_print = now
 
-                    print(f"\nDownload completed: {destination}")
-                    return
+                    print(_format_progress(downloaded_size, total_size))
+                    print(f"Download completed: {destination}")
+                    return True
                 else:
                     print(f"Failed to download file. Server responded with status code {response.status_code}.")
-                    return
-        except ChunkedEncodingError as e:
+                    return False
+        except (ChunkedEncodingError, requests.ConnectionError, requests.Timeout) as e:
             retries += 1
-            print(f"ChunkedEncodingError occurred: {e}. Retrying {retries}/{max_retries}...")
+            print(f"{type(e).__name__} occurred: {e}. Retrying {retries}/{max_retries}...")
             time.sleep(2**retries)
 
     raise Exception("Failed to download file after multiple retries.")
 
+def _download_range(url: str, destination: str, start: int, end: int, progress: dict, max_retries: int = 3,
+                    chunk_size: int = 1024 * 1024, session: requests.Session = None) -> None:
+    """
+    Downloads the byte range [start, end] of a file and writes it at the same offset of the destination file.
+
+    The destination file must already exist with its final size. Each call opens its own file handle, so
+    several ranges can be written concurrently. On connection errors, the download resumes from the last
+    byte written, retrying up to max_retries times with exponential backoff.
+    """
+    retries = 0
+    offset = start
 
+    while offset <= end:
+        pass_start = offset
+        try:
+            headers = {"Range": f"bytes={offset}-{end}"}
+            with (session or _SESSION).get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                if response.status_code != 206:
+                    raise requests.HTTPError(f"Range request failed with status code {response.status_code}.")
+
+                with open(destination, "r+b") as file:
+                    file.seek(offset)
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if chunk:  # Filter out keep-alive chunks
+                            file.write(chunk)
+                            offset += len(chunk)
+
+                            # Display progress, at most once every PROGRESS_INTERVAL seconds
+                            with progress['lock']:
+                                progress['downloaded'] += len(chunk)
+                                now = time.monotonic()
+                                if now - progress['last_print'] > PROGRESS_INTERVAL:
+                                    print(_format_progress(progress['downloaded'], progress['total']), end="\r")
+                                    progress['last_print'] = now
+        except (ChunkedEncodingError, requests.ConnectionError, requests.Timeout) as e:
+            retries += 1
+            if retries > max_retries:
+                raise Exception(f"Failed to download bytes {offset}-{end} after multiple retries.") from e
+            print(f"{type(e).__name__} occurred: {e}. Retrying {retries}/{max_retries}...")
+            time.sleep(2**retries)
+            continue
 
+        # A response that ends cleanly without any byte of the range also counts as a retry, so an empty
+        # 206 body cannot keep the loop spinning forever
+        if offset == pass_start:
+            retries += 1
+            if retries > max_retries:
+                raise Exception(f"Failed to download bytes {offset}-{end}: the server sent no data after multiple retries.")
+            print(f"No data received for bytes {offset}-{end}. Retrying {retries}/{max_retries}...")
+            time.sleep(2**retries)
 
+@measure_execution_time
+def download_large_file_parallel(url: str, destination: str, parallelism: int = 4, max_retries: int = 3,
+                                 chunk_size: int = 1024 * 1024, session: requests.Session = None) -> bool:
+    """
+    Downloads a single large file over several parallel HTTP Range requests.
 
+    Parameters:
+    -----------
+        url (str): The URL of the file to download.
+        destination (str): The local file path where the downloaded file will be saved.
+        parallelism (int): The number of byte ranges downloaded concurrently. Default is 4.
+        max_retries (int): The maximum number of times to retry each range on error. Default is 3.
+        chunk_size (int): The size of chunks to download the file in bytes. Default is 1 MB.
+        session (requests.Session): Optional session to use instead of the module's default pooled session.
+
+    Functionality:
+    --------------
+        - Sends a HEAD request to get the file size and check for 'Accept-Ranges: bytes' support. A failed
+          HEAD request is treated as no range support.
+        - Pre-allocates a '<destination>.part' file to the final size and renames it to destination only once
+          every range has completed, so a failed download never leaves a complete-looking file behind.
+        - Splits the file into `parallelism` byte ranges and downloads them in a thread pool, each range
+          writing its chunks directly at their offset so nothing is buffered in memory.
+        - Falls back to download_large_file when the server does not support range requests.
+
+    Note:
+    -----
+        - Splitting a download over several connections helps on rate-limited or high-latency links,
+          where a single TCP stream cannot use the available bandwidth.
+
+    Returns:
+    --------
+        bool: True if the download completed, False if the single stream fallback got an error status.
+
+    Raises:
+    -------
+        Exception: If any range fails after max_retries attempts.
+    """
+    # Many signed-URL and CDN endpoints reject HEAD (e.g. 403/405): treat that as no range support
+    try:
+        head = (session or _SESSION).head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        head_error = f"HEAD request failed ({type(e).__name__})"
+    else:
+        head_error = None if head.ok else f"HEAD request failed with status code {head.status_code}"
+    total_size = int(head.headers.get('Content-Length', 0)) if head_error is None else 0
+
+    # Fall back to a single stream if the server does not support range requests
+    if head_error is not None:
+        reason = head_error
+    elif head.headers.get('Accept-Ranges', '').lower() != 'bytes':
+        reason = "Server does not support range requests"
+    elif total_size == 0:
+        reason = "Server did not report the file size"
+    elif parallelism < 2:
+        reason = f"Parallelism is {parallelism}"
+    else:
+        reason = None
+    if reason is not None:
+        print(f"{reason}. Falling back to a single stream download.")
+        return download_large_file.__wrapped__(url, destination, max_retries=max_retries, chunk_size=chunk_size, session=session)
+
+    # Pre-allocate a partial file so every range can write at its own offset. It only replaces destination
+    # once all ranges are complete, and is removed if any range fails
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    part_path = f"{destination}.part"
+    with open(part_path, "wb") as file:
+        file.truncate(total_size)
+
+    range_size = -(-total_size // parallelism)
+    ranges = [(start, min(start + range_size, total_size) - 1) for start in range(0, total_size, range_size)]
+    progress = {'downloaded': 0, 'total': total_size, 'last_print': 0.0, 'lock': threading.Lock()}
+
+    print(f"Starting download: {destination} ({total_size} bytes in {len(ranges)} ranges)")
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(_download_range, url, part_path, start, end, progress, max_retries, chunk_size, session)
+                       for start, end in ranges]
+            for future in as_completed(futures):
+                future.result()
+    except BaseException:
+        os.remove(part_path)
+        raise
+    os.replace(part_path, destination)
+
+    print(_format_progress(progress['downloaded'], total_size))
+    print(f"Download completed: {destination}")
+    return True
+
+
+def download_many(jobs: list, downloader=download_shp, max_workers: int = 10) -> list:
+    """
+    Downloads several files concurrently by running one downloader call per job in a thread pool.
+
+    Downloads are I/O bound and socket reads release the GIL, so the files are fetched in parallel
+    on a single process instead of waiting on network latency one URL at a time. All workers share
+    one requests.Session whose connection pool is sized to max_workers, so TCP/TLS connections to
+    the same host are reused instead of being re-established for every file.
+
+    Parameters:
+    -----------
+        jobs (list): A list of dicts, each holding the keyword arguments of one downloader call
+            (e.g. {'url': ..., 'filename': ..., 'unzip': True} for download_shp).
+        downloader (callable): The download function applied to every job. Default is download_shp.
+            download_GeoTIFF and download_large_file can be used as well.
+        max_workers (int): The maximum number of concurrent downloads. Default is 10.
+
+    Returns:
+    --------
+        list: The failed jobs as (job, exception) tuples. Empty if all succeeded. Downloaders that handle
+            their own errors and return False are reported with a RuntimeError.
+    """
+    failures = []
+
+    # Share one pooled session across the worker threads
+    session = _make_session(max_workers)
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(downloader, **{'session': session, **job}): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                # The downloaders of this module catch request and file errors themselves and return False
+                if future.result() is False:
+                    raise RuntimeError(f"{getattr(downloader, '__name__', 'downloader')} reported a failed download")
+            except Exception as e:
+                print(f"Download failed for {futures[future].get('url')}: {e}")
+                failures.append((futures[future], e))
+
+    return failures
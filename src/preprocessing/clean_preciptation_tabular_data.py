@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def unpivot_preciptation_v2_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -6,14 +7,12 @@ def unpivot_preciptation_v2_data(df: pd.DataFrame) -> pd.DataFrame:
     cleaning the data, and restructuring it for easier analysis.
 
     The function performs the following steps:
-    1. Drops unnecessary columns.
-    2. Melts the DataFrame to long format based on the 'DATE' column.
-    3. Combines 'DATE' and 'Time_Attribute' for a new timestamp.
-    4. Extracts 'Attribute' from the 'Time_Attribute' column.
-    5. Pivots the data to separate out different measurements.
-    6. Renames the columns for clarity.
-    7. Replace -9999 (null values) by NA
-    8. Filter out observation prior to year 2014
+    1. Selects the 'DATE' and 15-minute value ('HHMMVal') columns, dropping metadata and flag columns.
+    2. Filter out observation prior to year 2014
+    3. Flattens the (days x 15-minute intervals) value matrix into a single column.
+    4. Builds the timestamps by adding each interval's time of day to its 'DATE'.
+    5. Assembles the 'date' and 'height' columns.
+    6. Replace -9999 (null values) by NaN
 
     Args:
     -----
@@ -24,51 +23,31 @@ def unpivot_preciptation_v2_data(df: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame: The transformed long-format DataFrame with measurements separated by attribute.
     """
 
-    columns_to_trop = ['STATION', 'ELEMENT','LATITUDE', 'LONGITUDE', 'ELEVATION', 'DlySum', 'DlySumMF', 'DlySumQF', 'DlySumS1', 'DlySumS2']
-    df = df.drop(columns=columns_to_trop)
+    # Identify the 15-minute value columns ('HHMMVal'), in chronological order
+    val_cols = sorted(col for col in df.columns if col.endswith('Val'))
+    time_of_day = np.array([int(col[:2]) * 60 + int(col[2:4]) for col in val_cols], dtype='timedelta64[m]')
 
-    # Identifying columns to melt
-    id_vars = ['DATE']
-    value_vars = [col for col in df.columns if col not in id_vars]
+    # Keep only the date and value columns; station metadata, daily sums and flags are not needed
+    df = df[['DATE'] + val_cols]
 
-    # Melting to long format
-    df_long = df.melt(id_vars=id_vars,
-                                        value_vars=value_vars,
-                                        var_name='Time_Attribute',
-                                        value_name='Value')
-
-    # Add Time to DATE column and extract Attribute from 'Time_Attribute'
-    df_long['DATE'] = df_long['DATE'].astype(str) + ' ' + df_long['Time_Attribute'].str[:4]
-    df_long['Attribute'] = df_long['Time_Attribute'].str[4:]
-
-    df_long = df_long.drop(columns=['Time_Attribute'])
-
-    # Pivoting to separate Value, Measurement Flag, Quality Flag, and Source Flags
-    df_final = df_long.pivot_table(
-        index=['DATE'], 
-        columns='Attribute', 
-        values='Value', 
-        aggfunc='first'
-    ).reset_index()
-
-    df_final.columns.name = None 
-    df_final = df_final.rename({
-        'DATE':'date',
-        'Val':'height'
-    }, axis='columns')
+    # Parse dates once per row and filter by date before reshaping, so discarded days are never unpivoted
+    days = pd.to_datetime(df['DATE'], format='%Y-%m-%d')
+    cutoff_date = pd.to_datetime('20140101')
+    df = df.assign(DATE=days).loc[days >= cutoff_date].sort_values('DATE')
 
-    # Drop columns
-    keep_columns = ['date','height']
-    df_final = df_final[keep_columns]
+    # Flatten the (days x intervals) value matrix row by row, so each day's intervals stay contiguous
+    heights = df[val_cols].to_numpy().ravel()
 
-    # Parse datetime column
-    df_final['date'] = pd.to_datetime(df_final['date'], format='%Y-%m-%d %H%M')
+    # Build one timestamp per value with datetime64 arithmetic: the day
+    # repeated for each interval plus the interval's time of day
+    dates = df['DATE'].to_numpy().repeat(len(val_cols)) + np.tile(time_of_day, len(df))
 
-    # Replace null values
-    df_final['height'] = df_final['height'].replace(-9999,pd.NA)
+    df_final = pd.DataFrame({
+        'date': dates,
+        'height': heights
+    })
 
-    # Filter by date
-    cutoff_date = pd.to_datetime('20140101')
-    df_final = df_final[df_final['date']>=cutoff_date]
+    # Replace null values (mask keeps the column float64, with NaN instead of object-dtype pd.NA)
+    df_final['height'] = df_final['height'].mask(df_final['height'].eq(-9999))
     
     return df_final
\ No newline at end of file
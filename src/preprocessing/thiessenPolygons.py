@@ -1,17 +1,77 @@
 import geopandas as gpd
 import numpy as np
-from shapely.geometry import Polygon
+import shapely
 from shapely.ops import unary_union
 from scipy.spatial import Voronoi, ConvexHull
 import math
+import weakref
+from itertools import chain
 
-def voronoi_finite_polygons_2d(vor, radius=None, buffer_ratio=10.0):
+# Clipping unions and masks already computed, keyed by (id(clipping_gdf), CRS). Each value holds a weak reference
+# to the clipping GeoDataFrame: entries whose frame has been garbage collected are evicted, and the identity
+# check on lookup guards against an id reused by another object.
+_clipping_union_cache = {}
+
+def _make_clip_mask(clipping_union):
+    """
+    Return the clipping union grown by a small buffer (to prevent gaps between clipped polygons), prepared for
+    repeated spatial predicates.
+    """
+    clip_mask = clipping_union.buffer(1e-6)
+    shapely.prepare(clip_mask)
+    return clip_mask
+
+def _get_clipping_union(clipping_gdf, crs):
+    """
+    Return the valid union of `clipping_gdf` geometries in `crs` and its clipping mask, computing them only once
+    per GeoDataFrame and CRS.
+
+    The cache assumes `clipping_gdf` is not modified in place between calls.
+    """
+    # Evict entries whose clipping GeoDataFrame no longer exists
+    for dead_key in [k for k, v in _clipping_union_cache.items() if v[0]() is None]:
+        del _clipping_union_cache[dead_key]
+
+    key = (id(clipping_gdf), str(crs))
+    cached = _clipping_union_cache.get(key)
+    if cached is not None and cached[0]() is clipping_gdf:
+        return cached[1], cached[2]
+
+    if clipping_gdf.crs is not None and crs is not None and clipping_gdf.crs != crs:
+        clipping_geometry = clipping_gdf.geometry.to_crs(crs)
+    else:
+        clipping_geometry = clipping_gdf.geometry
+
+    # make_valid is a no-op on valid geometries and repairs invalid ones without a full buffer computation
+    clipping_union = shapely.make_valid(unary_union(clipping_geometry))
+    clip_mask = _make_clip_mask(clipping_union)
+
+    _clipping_union_cache[key] = (weakref.ref(clipping_gdf), clipping_union, clip_mask)
+    return clipping_union, clip_mask
+
+def clear_clipping_union_cache():
+    """
+    Clear the cached clipping unions and masks used by `derive_thiessen_polygons`.
+
+    Call it after modifying a clipping GeoDataFrame in place, since cached entries are keyed on the
+    GeoDataFrame object and would otherwise keep returning the union of its previous geometries.
+    """
+    _clipping_union_cache.clear()
+
+def _ragged_indices(starts, lengths):
+    """
+    Return the concatenation of np.arange(start, start + length) for every (start, length) pair, without a Python loop.
+    """
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+def voronoi_finite_polygons_2d(vor, radius=None, buffer_ratio=10.0, center=None, use_hull_center=False):
     """
     Compute finite Voronoi regions for a 2D Voronoi diagram.
 
     This function processes a 2D Voronoi diagram (as produced by scipy.spatial.Voronoi) and converts any
     infinite regions into finite regions by extending their open ridges. The extension is performed along a
-    direction determined by the convex hull of the input points to maintain proper orientation. If a radius is
+    direction pointing away from the interior of the input points to maintain proper orientation. If a radius is
     not provided, it is computed based on the spatial extent of the input points and scaled by a buffer ratio.
 
     Parameters
@@ -23,6 +83,13 @@ def voronoi_finite_polygons_2d(vor, radius=None, buffer_ratio=10.0):
         bounding box of the input points multiplied by buffer_ratio.
     buffer_ratio : float, default=10.0
         Factor to scale the default radius based on the maximum extent (width or height) of the input points.
+    center : array-like of shape (2,), optional
+        Reference point used to orient the extension of infinite ridges outwards. It must lie strictly inside the
+        convex hull of the input points. If None, the centroid of the input points is used.
+    use_hull_center : bool, default=False
+        If True and `center` is None, use the mean of the convex hull vertices as the reference point (legacy
+        behavior, requires an extra qhull pass). Both choices lie strictly inside the hull and yield the same
+        ridge directions.
 
     Returns
     -------
@@ -40,7 +107,7 @@ def voronoi_finite_polygons_2d(vor, radius=None, buffer_ratio=10.0):
     Notes
     -----
     Infinite regions are identified by negative vertex indices. For each such region, the function finds the
-    corresponding ridge, computes a direction based on the unit normal and the convex hull center, and extends
+    corresponding ridge, computes a direction based on the unit normal and the reference center, and extends
     the ridge by a specified radius to generate a finite vertex. The vertices for each region are then sorted in
     counterclockwise order using the centroid of the region's vertices.
     """
@@ -48,60 +115,93 @@ def voronoi_finite_polygons_2d(vor, radius=None, buffer_ratio=10.0):
     if vor.points.shape[1] != 2:
         raise ValueError("Requires 2D input")
 
-    new_regions = []
-    new_vertices = vor.vertices.tolist()
-    
-    # Calculate convex hull of input points for directionality
-    hull = ConvexHull(vor.points)
-    hull_points = vor.points[hull.vertices]
-    hull_center = np.mean(hull_points, axis=0)
+    # Reference point for directionality. Infinite ridges lie on convex hull edges, so any point strictly
+    # inside the hull (such as the centroid of the input points) gives the same outward orientation
+    if center is not None:
+        hull_center = np.asarray(center, dtype=np.float64)
+    elif use_hull_center:
+        hull = ConvexHull(vor.points)
+        hull_points = vor.points[hull.vertices]
+        hull_center = np.mean(hull_points, axis=0)
+    else:
+        hull_center = vor.points.mean(axis=0)
     
     if radius is None:
-        min_x, max_x = np.min(vor.points[:,0]), np.max(vor.points[:,0])
-        min_y, max_y = np.min(vor.points[:,1]), np.max(vor.points[:,1])
-        radius = buffer_ratio * max(max_x - min_x, max_y - min_y)
-
-    ridge_dict = {}
-    for (p1, p2), (v1, v2) in zip(vor.ridge_points, vor.ridge_vertices):
-        ridge_dict.setdefault(p1, []).append((p2, v1, v2))
-        ridge_dict.setdefault(p2, []).append((p1, v1, v2))
-
-    for p1, region_idx in enumerate(vor.point_region):
-        vertices = vor.regions[region_idx]
-        if all(v >= 0 for v in vertices):
-            new_regions.append(vertices)
-            continue
-
-        finite_verts = [v for v in vertices if v >= 0]
-        ridges = ridge_dict.get(p1, [])
-
-        for p2, v1, v2 in ridges:
-            if v2 < 0:
-                v1, v2 = v2, v1
-            if v1 >= 0:
-                continue
-
-            t = vor.points[p2] - vor.points[p1]
-            t /= np.linalg.norm(t)
-            n = np.array([-t[1], t[0]])
-
-            midpoint = 0.5 * (vor.points[p1] + vor.points[p2])
-            direction = np.sign(np.dot(midpoint - hull_center, n)) * n
-            far_point = vor.vertices[v2] + direction * radius
-
-            finite_verts.append(len(new_vertices))
-            new_vertices.append(far_point.tolist())
-
-        if finite_verts:
-            vs = np.array([new_vertices[v] for v in finite_verts])
-            c = vs.mean(axis=0)  # Use region's vertex centroid for sorting
-            angles = np.arctan2(vs[:,1]-c[1], vs[:,0]-c[0])
-            finite_verts = np.array(finite_verts)[np.argsort(angles)]
-            new_regions.append(finite_verts.tolist())
-
-    return new_regions, np.array(new_vertices)
-
-def derive_thiessen_polygons(gdf_points, clipping_gdf, preserve_attribute):
+        radius = buffer_ratio * np.ptp(vor.points, axis=0).max()
+
+    # Extend every infinite ridge at once. Both regions sharing a ridge get the same far point,
+    # since the normal and its orientation sign flip together when seen from the other side
+    ridge_points = np.asarray(vor.ridge_points)
+    if isinstance(vor.ridge_vertices, np.ndarray):
+        ridge_vertices = vor.ridge_vertices
+    else:
+        # scipy exposes ridge_vertices as a list of 2-element lists; filling a flat array from an iterator
+        # is much faster than np.asarray on the nested lists
+        ridge_vertices = np.fromiter(chain.from_iterable(vor.ridge_vertices), dtype=np.intp,
+                                     count=2 * len(vor.ridge_vertices)).reshape(-1, 2)
+    infinite = (ridge_vertices < 0).any(axis=1)
+    rp = ridge_points[infinite]
+    rv_finite = ridge_vertices[infinite].max(axis=1)
+
+    t = vor.points[rp[:,1]] - vor.points[rp[:,0]]
+    # hypot on the two columns avoids the generic N-D dispatch of np.linalg.norm
+    t /= np.hypot(t[:,0], t[:,1])[:,None]
+    n = np.column_stack([-t[:,1], t[:,0]])
+
+    midpoints = 0.5 * (vor.points[rp[:,0]] + vor.points[rp[:,1]])
+    directions = np.sign(np.einsum('ij,ij->i', midpoints - hull_center, n))[:,None] * n
+    far_points = vor.vertices[rv_finite] + directions * radius
+
+    new_vertices = np.vstack([vor.vertices, far_points])
+
+    # Group the far point indices by input point (CSR layout: point p owns far_ids[indptr[p]:indptr[p+1]])
+    owners = np.concatenate([rp[:,0], rp[:,1]])
+    far_ids = np.tile(np.arange(len(vor.vertices), len(new_vertices)), 2)
+    far_ids = far_ids[np.argsort(owners, kind='stable')]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(owners, minlength=len(vor.points)))])
+
+    # Classify every region as finite or infinite in one pass over the flattened regions (an infinite
+    # region has a negative vertex index, so its minimum index is negative)
+    region_sizes = np.fromiter(map(len, vor.regions), dtype=np.intp, count=len(vor.regions))
+    region_flat = np.fromiter(chain.from_iterable(vor.regions), dtype=np.intp, count=region_sizes.sum())
+    region_starts = np.cumsum(region_sizes) - region_sizes
+    nonempty = region_sizes > 0
+    region_infinite = np.zeros(len(vor.regions), dtype=bool)
+    region_infinite[nonempty] = np.minimum.reduceat(region_flat, region_starts[nonempty]) < 0
+
+    # Finite regions are kept as they are; only infinite regions are closed and sorted below
+    new_regions = [vor.regions[region_idx] for region_idx in vor.point_region]
+    infinite_points = np.flatnonzero(region_infinite[vor.point_region])
+    infinite_regions = vor.point_region[infinite_points]
+
+    # Gather, for all infinite regions at once, their finite vertices followed by their far points,
+    # with a parallel label array giving the position of the owning region in infinite_points
+    far_counts = indptr[infinite_points + 1] - indptr[infinite_points]
+    verts = np.concatenate([
+        region_flat[_ragged_indices(region_starts[infinite_regions], region_sizes[infinite_regions])],
+        far_ids[_ragged_indices(indptr[infinite_points], far_counts)]
+    ])
+    labels = np.concatenate([
+        np.repeat(np.arange(len(infinite_points)), region_sizes[infinite_regions]),
+        np.repeat(np.arange(len(infinite_points)), far_counts)
+    ])
+    keep = verts >= 0
+    verts, labels = verts[keep], labels[keep]
+
+    # Sort each region's vertices counterclockwise around the region's vertex centroid
+    counts = np.bincount(labels, minlength=len(infinite_points))
+    vs = new_vertices[verts]
+    cx = np.bincount(labels, weights=vs[:,0], minlength=len(infinite_points)) / counts
+    cy = np.bincount(labels, weights=vs[:,1], minlength=len(infinite_points)) / counts
+    angles = np.arctan2(vs[:,1]-cy[labels], vs[:,0]-cx[labels])
+    sorted_verts = verts[np.lexsort((angles, labels))]
+
+    for p1, region in zip(infinite_points, np.split(sorted_verts, np.cumsum(counts)[:-1])):
+        new_regions[p1] = region.tolist()
+
+    return new_regions, new_vertices
+
+def derive_thiessen_polygons(gdf_points, clipping_gdf, preserve_attribute, clipping_union=None):
     """
     Generate robust Thiessen (Voronoi) polygons from point data clipped to an irregular boundary.
 
@@ -121,6 +221,11 @@ def derive_thiessen_polygons(gdf_points, clipping_gdf, preserve_attribute):
         Thiessen polygons.
     preserve_attribute : str
         The name of the attribute column in `gdf_points` to retain in the output GeoDataFrame.
+    clipping_union : shapely.geometry.base.BaseGeometry, optional
+        Pre-computed, valid union of the geometries in `clipping_gdf`, in the CRS of `gdf_points`. If None,
+        the union is computed once per `clipping_gdf` and CRS and cached for subsequent calls. The cache is
+        keyed on the GeoDataFrame object, not its contents: after editing `clipping_gdf` in place, call
+        `clear_clipping_union_cache()` (or pass a new GeoDataFrame), otherwise the stale union is reused.
 
     Returns
     -------
@@ -128,9 +233,18 @@ def derive_thiessen_polygons(gdf_points, clipping_gdf, preserve_attribute):
         A GeoDataFrame containing the clipped Thiessen polygons with the preserved attribute. The output
         GeoDataFrame maintains the same coordinate reference system (CRS) as the input `gdf_points`.
 
+    Raises
+    ------
+    TypeError
+        If `gdf_points` contains geometries other than points.
+    ValueError
+        If `gdf_points` contains empty points.
+
     Notes
     -----
-    - The function first validates and cleans the clipping geometries to ensure a proper boundary.
+    - The function first validates and cleans the clipping geometries to ensure a proper boundary. They are
+    reprojected to the CRS of `gdf_points` if needed, and the resulting union is cached for later calls
+    (see `clear_clipping_union_cache`).
     - An adaptive radius is computed based on the bounding box diagonal of the clipping union to extend
     infinite Voronoi regions.
     - The external function `voronoi_finite_polygons_2d` is used to convert infinite regions into finite polygons.
@@ -138,10 +252,18 @@ def derive_thiessen_polygons(gdf_points, clipping_gdf, preserve_attribute):
     geometry artifacts are cleaned from the final output.
     """
 
-    # Validate and prepare geometries
-    clipping_union = unary_union(clipping_gdf.geometry).buffer(0)
-    if not clipping_union.is_valid:
-        clipping_union = clipping_union.buffer(0)
+    if not (gdf_points.geom_type.to_numpy() == 'Point').all():
+        raise TypeError("All geometries in gdf_points must be Points")
+
+    # get_coordinates skips empty points, which would shift every polygon onto another point's attribute
+    if shapely.is_empty(gdf_points.geometry.values).any():
+        raise ValueError("gdf_points must not contain empty geometries")
+
+    # Validate and prepare geometries (cached across calls sharing the same clipping_gdf)
+    if clipping_union is None:
+        clipping_union, clip_mask = _get_clipping_union(clipping_gdf, gdf_points.crs)
+    else:
+        clip_mask = _make_clip_mask(clipping_union)
 
     # Calculate adaptive radius based on bounding box diagonal
     bounds = clipping_union.bounds
@@ -149,39 +271,49 @@ def derive_thiessen_polygons(gdf_points, clipping_gdf, preserve_attribute):
     radius = 2.5 * diag_length  # Conservative radius
 
     # Generate Voronoi diagram
-    points = np.array([[pt.x, pt.y] for pt in gdf_points.geometry])
+    points = shapely.get_coordinates(gdf_points.geometry.values)
     vor = Voronoi(points)
     regions, vertices = voronoi_finite_polygons_2d(vor, radius=radius)
 
-    # Create and clean polygons
-    polys = []
-    for region in regions:
-        poly = Polygon(vertices[region]).buffer(0)
-        if not poly.is_valid:
-            poly = poly.buffer(0)
-        polys.append(poly)
-
-    # Create GeoDataFrame and clip
-    thiessen_gdf = gpd.GeoDataFrame(
-        gdf_points[[preserve_attribute]],
-        geometry=polys,
-        crs=gdf_points.crs
-    )
+    # Create and clean all polygons at once from a flat coordinate array (ragged layout: ring i owns
+    # the coordinates where indices == i), without building one small array per region
+    region_sizes = np.fromiter(map(len, regions), dtype=np.intp, count=len(regions))
+    flat_regions = np.fromiter(chain.from_iterable(regions), dtype=np.intp, count=region_sizes.sum())
+    coords = vertices[flat_regions]
+    indices = np.repeat(np.arange(len(regions)), region_sizes)
+    polys = shapely.make_valid(shapely.polygons(shapely.linearrings(coords, indices=indices)))
+
+    # Clip with the buffered mask, intersecting only the polygons that overlap it
+    hits = np.sort(shapely.STRtree(polys).query(clip_mask, predicate='intersects'))
 
-    # Use overlay with small buffer to prevent gaps
-    clip_mask = gpd.GeoDataFrame(geometry=[clipping_union.buffer(1e-6)], crs=thiessen_gdf.crs)
-    thiessen_clipped = gpd.overlay(
-        thiessen_gdf,
-        clip_mask,
-        how='intersection',
-        keep_geom_type=False
-    ).explode(index_parts=False).reset_index(drop=True)
+    # Intersect and explode into single parts with vectorized shapely calls, keeping polygonal parts only
+    parts, part_index = shapely.get_parts(shapely.intersection(polys[hits], clip_mask), return_index=True)
+    is_polygon = shapely.get_type_id(parts) == shapely.GeometryType.POLYGON
+    parts, part_index = parts[is_polygon], part_index[is_polygon]
 
     # Clean any remaining artifacts
-    thiessen_clipped['geometry'] = thiessen_clipped.geometry.buffer(0)
-    thiessen_clipped = thiessen_clipped[~thiessen_clipped.geometry.is_empty]
+    parts = shapely.buffer(parts, 0)
+    not_empty = ~shapely.is_empty(parts)
+    parts, owners = parts[not_empty], hits[part_index][not_empty]
+
+    # Merge polygons with same ID: sort the parts by attribute and union each group of consecutive parts
+    # (groups with a single part, the usual case for Thiessen polygons, are kept as they are)
+    # (rows with a missing attribute are dropped, as dissolve does)
+    attribute = gdf_points[preserve_attribute]
+    has_value = attribute.iloc[owners].notna().to_numpy()
+    parts, owners = parts[has_value], owners[has_value]
+    order = np.argsort(attribute.iloc[owners].to_numpy(), kind='stable')
+    parts, owners = parts[order], owners[order]
+    _, group_starts = np.unique(attribute.iloc[owners].to_numpy(), return_index=True)
+    # (np.split always yields at least one group, so no parts must give no rows rather than one empty union)
+    merged = [group[0] if len(group) == 1 else shapely.unary_union(group)
+              for group in np.split(parts, group_starts[1:])] if len(parts) else []
 
-    #Merge polygons with same ID
-    thiessen_clipped = thiessen_clipped.dissolve(by= preserve_attribute, as_index=False)
+    # Create GeoDataFrame of the clipped polygons
+    thiessen_clipped = gpd.GeoDataFrame(
+        attribute.iloc[owners[group_starts]].to_frame().reset_index(drop=True),
+        geometry=merged,
+        crs=gdf_points.crs
+    )
     
     return thiessen_clipped
\ No newline at end of file
@@ -1,5 +1,9 @@
+import sys
 import pandas as pd
 
+__all__ = ['glimpse']
+
+
 def glimpse(df: pd.DataFrame) -> None:
     """
     Displays a summary of a pandas DataFrame, similar to pd.DataFrame.info().
@@ -15,10 +19,6 @@ def glimpse(df: pd.DataFrame) -> None:
     --------
     None
     """
-    # Print the number of rows and columns
-    print(f"Rows: {df.shape[0]}")
-    print(f"Columns: {df.shape[1]}")
-
     # Determine the maximum column name and dtype lengths for formatting
     dtypes = df.dtypes.astype(str).tolist()
     dtypes_len = max(len(dtype) for dtype in dtypes) + 1
@@ -27,20 +27,26 @@ def glimpse(df: pd.DataFrame) -> None:
     columns_len = max(len(col) for col in columns) + 1
     columns_len = min(columns_len, 29)  # Limit the column name length to 29
 
-    # Build the header for column details
-    col_info = [' ' * columns_len + ' Null Count  Dtype' + ' ' * (dtypes_len - 4) + 'First Values',
+    # Build the header for column details, starting with the number of rows and columns
+    col_info = [f"Rows: {df.shape[0]}",
+                f"Columns: {df.shape[1]}",
+                ' ' * columns_len + ' Null Count  Dtype' + ' ' * (dtypes_len - 4) + 'First Values',
                 ' ' * columns_len + ' ----------  -----' + ' ' * (dtypes_len - 4) + '-------------']
 
+    # Compute the null counts of all columns at once and take the first 5 rows a single time
+    null_counts = df.isna().sum().tolist()
+    head = df.head()
+
+    # Format template for each column line, built once instead of re-parsing the format spec per column
+    row_template = f"{{:<{columns_len}}} {{:<10}}  {{:<{dtypes_len}}} [{{}}]"
+
     # Add details for each column
-    for col in df.columns:
+    for i, (col, null_count, dtype) in enumerate(zip(columns, null_counts, dtypes)):
         col_edited = col[:27] + '...' if len(col) > 29 else col  # Shorten long column names
-        null_count = df[col].isnull().sum()
-        dtype = df[col].dtype
-        first_values = ', '.join(map(str, df[col].head().values))  # Format first 5 values
+        first_values = ', '.join(map(str, head.iloc[:, i].values))  # Format first 5 values
 
         # Append the formatted column information
-        col_info.append(f"{col_edited:<{columns_len}} {null_count:<10}  {str(dtype):<{dtypes_len}} [{first_values}]")
+        col_info.append(row_template.format(col_edited, null_count, dtype, first_values))
 
-    # Print the column details
-    for col in col_info:
-        print(col)
+    # Print the column details with a single write
+    sys.stdout.write('\n'.join(col_info) + '\n')
@@ -1,6 +1,17 @@
+import io
 import pickle
 import types
 
+def _is_picklable(value) -> bool:
+    """
+    Return True if `value` can be pickled.
+    """
+    try:
+        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return False
+    return True
+
 def save_workspace(filename):
     """
     Save the current global workspace to a file using pickle.
@@ -9,11 +20,13 @@ def save_workspace(filename):
       - Built-in variables (those whose names start with '__')
       - Imported modules
       - Callable objects (such as functions)
-      - Objects that cannot be pickled
+      - Objects that cannot be pickled (generators, frames, open file handles, ...)
 
     The remaining variables are then serialized to the specified file using the
-    pickle module. The saved file can later be loaded to restore the workspace
-    in another session.
+    pickle module. Variables are not serialized a first time just to test them:
+    the workspace is pickled once, and only if that fails are the offending
+    variables identified, dropped and the file written again. The saved file can
+    later be loaded to restore the workspace in another session.
 
     Parameters:
     -----------
@@ -26,7 +39,10 @@ def save_workspace(filename):
     # Copy the global namespace
     all_vars = globals().copy()
 
-    # Filter out built-ins, modules, and callables.
+    # Types that can never be pickled, skipped without attempting to serialize them
+    unpicklable_types = (types.GeneratorType, types.CoroutineType, types.AsyncGeneratorType, types.FrameType)
+
+    # Filter out built-ins, modules, callables and known unpicklable objects.
     filtered_vars = {}
     for var_name, var_val in all_vars.items():
         if var_name.startswith('__'):
@@ -35,13 +51,22 @@ def save_workspace(filename):
             continue
         if callable(var_val):
             continue
-        try:
-            # Test if the variable can be pickled
-            pickle.dumps(var_val)
-        except Exception:
+        if isinstance(var_val, unpicklable_types):
+            continue
+        # Open files and other OS-level streams; in-memory BytesIO/StringIO buffers pickle fine and are kept
+        if isinstance(var_val, io.IOBase) and not isinstance(var_val, (io.BytesIO, io.StringIO)):
             continue
         filtered_vars[var_name] = var_val
 
-    with open(filename, 'wb') as f:
-        pickle.dump(filtered_vars, f)
+    # Large write buffer: pickle issues many small writes, and protocol 5 (pickle.HIGHEST_PROTOCOL)
+    # writes numpy/pandas data buffers straight to the file without an intermediate bytes copy
+    with open(filename, 'wb', buffering=1 << 20) as f:
+        try:
+            pickle.dump(filtered_vars, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Some variable cannot be pickled: drop the offending ones and write the file again
+            filtered_vars = {var_name: var_val for var_name, var_val in filtered_vars.items() if _is_picklable(var_val)}
+            f.seek(0)
+            f.truncate()
+            pickle.dump(filtered_vars, f, protocol=pickle.HIGHEST_PROTOCOL)
 
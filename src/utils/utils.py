@@ -1,16 +1,24 @@
-from time import time
+from time import perf_counter
 import json
+import os
+from pathlib import Path
 from functools import wraps
 
+# orjson is optional: it parses and serializes JSON several times faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def measure_execution_time(func):
     """
     Decorator to measure and print the time taken to execute a function.
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time()  # Record start time
+        start_time = perf_counter()  # Record start time
         result = func(*args, **kwargs)  # Execute the function
-        end_time = time()  # Record end time
+        end_time = perf_counter()  # Record end time
         execution_time = end_time - start_time
         if execution_time < 60:
             print(f"Function '{func.__name__}' executed in {execution_time:.4f} seconds.")
@@ -29,11 +37,16 @@ def process_notebook(input_path):
     
     Args:
     -----
-        input_path (str): Path to the input .ipynb file.
+        input_path (str or Path): Path to the input .ipynb file. The cleaned copy is saved next to it
+            as '<notebook name>_cleaned.json'.
     """
     # Load the notebook
-    with open(input_path, 'r', encoding='utf-8') as file:
-        notebook_data = json.load(file)
+    if orjson is not None:
+        with open(input_path, 'rb') as file:
+            notebook_data = orjson.loads(file.read())
+    else:
+        with open(input_path, 'r', encoding='utf-8') as file:
+            notebook_data = json.load(file)
     
     # Clear outputs from all code cells
     for cell in notebook_data.get("cells", []):
@@ -41,10 +54,19 @@ def process_notebook(input_path):
             cell["outputs"] = []
             cell["execution_count"] = None
     
-    # Save the updated notebook with a modified extension
-    output_path = input_path.replace('.ipynb', '_cleaned.json')
-    with open(output_path, 'w', encoding='utf-8') as file:
-        json.dump(notebook_data, file, indent=4)
+    # Save the updated notebook with a modified extension. It is written to a temporary file first and then
+    # renamed over the output, so an interrupted write never leaves a truncated file behind
+    # (orjson only supports a 2-space indent; the json fallback keeps the original 4-space, ASCII-escaped output)
+    input_path = Path(input_path)
+    output_path = input_path.with_name(input_path.stem + '_cleaned.json')
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+    if orjson is not None:
+        with open(tmp_path, 'wb', buffering=1 << 20) as file:
+            file.write(orjson.dumps(notebook_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as file:
+            json.dump(notebook_data, file, indent=4)
+    os.replace(tmp_path, output_path)
     
     print(f"Notebook cleaned and saved to: {output_path}")
 